@@ -1,26 +1,86 @@
+import os
+import numpy as np
 import pandas as pd
 import random
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from flask import Flask, render_template, jsonify, request, session, Response
-from collections import Counter
+from flask_session import Session
+from cachelib import FileSystemCache
 
 app = Flask(__name__)
 app.secret_key = "supersecretkey"
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Keep session data server-side so the cookie only carries the session id
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    import redis
+    app.config["SESSION_TYPE"] = "redis"
+    app.config["SESSION_REDIS"] = redis.from_url(REDIS_URL)
+else:
+    # Local fallback, anchored next to app.py rather than the working directory
+    app.config["SESSION_TYPE"] = "cachelib"
+    app.config["SESSION_CACHELIB"] = FileSystemCache(
+        os.environ.get("SESSION_DIR", os.path.join(BASE_DIR, "flask_session")),
+        threshold=10000,
+    )
+# Only write the store when the session changed, so slow requests like
+# /proxy_video can't write back a stale copy over a concurrent /like
+app.config["SESSION_REFRESH_EACH_REQUEST"] = False
+Session(app)
+
 # Credentials for university database
 DB_USERNAME = "videodata"
 DB_PASSWORD = "ShortVideo@10000"
 
-# Load dataset
-video_df = pd.read_csv("backend-ml/data/video_clusters.csv")
+# Load dataset (only the columns we use; labels stay nullable until NaNs are dropped)
+VIDEO_CLUSTERS_PARQUET = os.path.join(BASE_DIR, "backend-ml/data/video_clusters.parquet")
+VIDEO_CLUSTERS_CSV = os.path.join(BASE_DIR, "backend-ml/data/video_clusters.csv")
+
+# Parquet is only used when it is at least as fresh as the CSV written alongside it
+if os.path.exists(VIDEO_CLUSTERS_PARQUET) and (
+    not os.path.exists(VIDEO_CLUSTERS_CSV)
+    or os.path.getmtime(VIDEO_CLUSTERS_PARQUET) >= os.path.getmtime(VIDEO_CLUSTERS_CSV)
+):
+    video_df = pd.read_parquet(VIDEO_CLUSTERS_PARQUET, columns=["pid", "dbscan_cluster_label"])
+else:
+    video_df = pd.read_csv(
+        VIDEO_CLUSTERS_CSV,
+        usecols=["pid", "dbscan_cluster_label"],
+        dtype={"pid": "int64", "dbscan_cluster_label": "float32"},
+    )
 
 # Remove rows where cluster is NaN
 video_df = video_df.dropna(subset=["dbscan_cluster_label"])
+video_df["dbscan_cluster_label"] = video_df["dbscan_cluster_label"].astype("int32")
+
+# Pre-group video ids by cluster so picking a reel doesn't scan the whole table
+CLUSTER_TO_PIDS = {
+    int(label): group["pid"].to_numpy(dtype=np.int64)
+    for label, group in video_df.groupby("dbscan_cluster_label", sort=False)
+}
+
+# Row-aligned arrays for picking any reel without touching the DataFrame
+ALL_PIDS = video_df["pid"].to_numpy(dtype=np.int64)
+ALL_CLUSTERS = video_df["dbscan_cluster_label"].to_numpy(dtype=np.int32)
 
 # Your real dataset base URL
 BASE_URL = "https://fi.ee.tsinghua.edu.cn/datasets/short-video-dataset/raw_file/"
 
+# Shared HTTP session so upstream connections are reused across proxied videos
+video_session = requests.Session()
+video_session.auth = HTTPBasicAuth(DB_USERNAME, DB_PASSWORD)
+video_session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=128))
+
+# Bytes relayed per chunk when streaming a video back to the client
+STREAM_CHUNK_SIZE = 65536
+
+# Upstream headers passed through to the client so seeking keeps working
+PASSTHROUGH_HEADERS = ("Content-Length", "Content-Range", "Accept-Ranges", "ETag", "Content-Encoding")
+
 
 @app.route("/")
 def home():
@@ -32,7 +92,8 @@ def home():
 def start_session():
     username = request.json.get("username")
     session["username"] = username
-    session["liked_clusters"] = []
+    session["cluster_counts"] = {}
+    session["fav_cluster"] = None
     return jsonify({"message": "Session started"})
 
 
@@ -46,11 +107,17 @@ def like():
     if cluster is None:
         return jsonify({"error": "No cluster provided"}), 400
 
-    liked = session.get("liked_clusters", [])
-    liked.append(cluster)
-    session["liked_clusters"] = liked
-    
-    print(f"Updated liked clusters: {session['liked_clusters']}")
+    # Keep a running like count per cluster and track the most liked one
+    counts = session.get("cluster_counts", {})
+    key = str(cluster)
+    counts[key] = counts.get(key, 0) + 1
+    session["cluster_counts"] = counts
+
+    fav_cluster = session.get("fav_cluster")
+    if fav_cluster is None or counts[key] > counts.get(str(fav_cluster), 0):
+        session["fav_cluster"] = cluster
+
+    print(f"Updated cluster counts: {counts}, favourite: {session['fav_cluster']}")
 
     return jsonify({"message": "Cluster stored", "cluster": cluster})
 
@@ -58,25 +125,19 @@ def like():
 @app.route("/get_next_reel")
 def get_next_reel():
 
-    liked = session.get("liked_clusters", [])
-
     # Bias towards most liked cluster
-    if liked:
-        fav_cluster = Counter(liked).most_common(1)[0][0]
-
-        filtered = video_df[
-            video_df["dbscan_cluster_label"] == fav_cluster
-        ]
-
-        if not filtered.empty:
-            row = filtered.sample(1).iloc[0]
-        else:
-            row = video_df.sample(1).iloc[0]
+    fav_cluster = session.get("fav_cluster")
+    fav_pids = None
+    if fav_cluster is not None:
+        fav_pids = CLUSTER_TO_PIDS.get(fav_cluster)
+
+    if fav_pids is not None:
+        video_id = int(fav_pids[np.random.randint(fav_pids.size)])
+        cluster = int(fav_cluster)
     else:
-        row = video_df.sample(1).iloc[0]
-
-    video_id = int(row["pid"])
-    cluster = int(row["dbscan_cluster_label"])
+        index = np.random.randint(ALL_PIDS.size)
+        video_id = int(ALL_PIDS[index])
+        cluster = int(ALL_CLUSTERS[index])
 
     # Use proxy endpoint instead of direct URL
     video_url = f"/proxy_video/{video_id}"
@@ -93,24 +154,52 @@ def get_next_reel():
 def proxy_video(video_id):
     """Proxy endpoint to fetch video with HTTP Basic Auth"""
     video_url = f"{BASE_URL}{video_id}.mp4"
-    
+
+    # Ask for the raw bytes so they can be relayed without re-encoding
+    headers = {"Accept-Encoding": "identity"}
+    if "Range" in request.headers:
+        headers["Range"] = request.headers["Range"]
+
     try:
         # Fetch video with authentication
-        response = requests.get(
+        response = video_session.get(
             video_url,
-            auth=HTTPBasicAuth(DB_USERNAME, DB_PASSWORD),
+            headers=headers,
             stream=True,
             timeout=30
         )
-        
-        if response.status_code == 200:
+
+        if response.status_code in (200, 206):
+            passthrough = {
+                name: response.headers[name]
+                for name in PASSTHROUGH_HEADERS
+                if name in response.headers
+            }
+
             # Stream the video back to client
-            return Response(
-                response.iter_content(chunk_size=8192),
+            proxied = Response(
+                response.raw.stream(STREAM_CHUNK_SIZE, decode_content=False),
+                status=response.status_code,
+                headers=passthrough,
                 content_type=response.headers.get('content-type', 'video/mp4')
             )
-        else:
+            # Hand the upstream connection back to the pool once the client is done
+            proxied.call_on_close(response.close)
+            return proxied
+        elif response.status_code == 416:
+            # Requested range is outside the video; let the browser see the real size
+            response.close()
+            headers = {}
+            if "Content-Range" in response.headers:
+                headers["Content-Range"] = response.headers["Content-Range"]
+            return Response(status=416, headers=headers)
+        elif response.status_code == 404:
+            response.close()
             return jsonify({"error": "Video not found"}), 404
+        else:
+            print(f"Upstream returned {response.status_code} for video {video_id}")
+            response.close()
+            return jsonify({"error": "Failed to fetch video"}), 502
     except Exception as e:
         print(f"Error proxying video {video_id}: {str(e)}")
         return jsonify({"error": "Failed to fetch video"}), 500
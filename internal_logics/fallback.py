@@ -1,4 +1,3 @@
-from sklearn.metrics import pairwise_distances
 import numpy as np
 
 def predict_with_fallback(preprocessor_pipeline, centroids_df , fav_clusters_latest, raw_point):
@@ -11,7 +10,14 @@ def predict_with_fallback(preprocessor_pipeline, centroids_df , fav_clusters_lat
         raise ValueError("preprocessor_pipeline must be provided to transform raw_point")
     transformed_point = preprocessor_pipeline.transform([raw_point])
     
-    distances = pairwise_distances(transformed_point, centroids_df.values)
+    centroids = centroids_df.to_numpy(dtype=np.float64)
+    point = np.asarray(transformed_point, dtype=np.float64).ravel()
+    if not np.isfinite(point).all():
+        # e.g. an unknown gender maps to NaN; never guess a cluster from that
+        raise ValueError("Input contains NaN, infinity or a value too large for dtype('float64').")
+
+    # Squared euclidean distance up to a constant: ||c||^2 - 2 c.q (||q||^2 is the same for every centroid)
+    distances = np.einsum('ij,ij->i', centroids, centroids) - 2.0 * (centroids @ point)
     
     # Find the index of the centroid with the minimum distance
     closest_centroid_index = np.argmin(distances)
@@ -1,9 +1,10 @@
 from sklearn.base import BaseEstimator, TransformerMixin
+import pandas as pd
 
 class SimplifiedFrequencyMapper(BaseEstimator, TransformerMixin):
     """
     This class replaces rare categories with a default value.
-    The code is written with simple loops for clarity.
+    Each column is processed in one vectorized pass with pandas.
     """
     def __init__(self, threshold=40):
         self.threshold = threshold
@@ -13,26 +14,20 @@ class SimplifiedFrequencyMapper(BaseEstimator, TransformerMixin):
         for column_name in X.columns:
             category_counts = X[column_name].value_counts()
             frequent_ones = category_counts[category_counts >= self.threshold]
-            self.common_categories[column_name] = list(frequent_ones.index)
+            self.common_categories[column_name] = frozenset(frequent_ones.index)
         return self
 
     def transform(self, X):     #actual writing to data
         X_copy = X.copy()
         for column_name in X.columns:
-            # Get the list of common categories that we learned during .fit()
-            learned_common_list = self.common_categories[column_name]
-            
-            new_values = []
-            
-            for value in X_copy[column_name]:
-                # Check if the current value is in our list of common ones
-                if value in learned_common_list:
-                    # If it is, keep the original value
-                    new_values.append(value)
-                else:
-                    # If it's not common, replace it with our default value
-                    new_values.append(str(self.threshold))
-            # Replace the old column with our new list of processed values
-            X_copy[column_name] = new_values
-            
-        return X_copy
\ No newline at end of file
+            # Get the common categories that we learned during .fit()
+            learned_common = self.common_categories[column_name]
+            column = X_copy[column_name]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                # A categorical column can't take the default value as a new category
+                column = column.astype(object)
+
+            # Keep common values, replace everything else with our default value
+            X_copy[column_name] = column.where(column.isin(learned_common), other=str(self.threshold))
+
+        return X_copy
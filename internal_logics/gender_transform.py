@@ -1,19 +1,21 @@
 from sklearn.base import BaseEstimator, TransformerMixin
+import pandas as pd
 
 class GenderTransformer(BaseEstimator, TransformerMixin):
     """
     This is an improved version of the GenderTransformer.
     It uses the efficient .map() function for clarity and performance.
     """
+    # Use a dictionary to define the mapping
+    gender_map = {'M': 0, 'F': 1}
+
     def fit(self, X, y=None):
         return self
         
     def transform(self, X):
-        X_copy = X.copy()
-        
-        for col in X_copy.columns:
-            # Use a dictionary to define the mapping
-            gender_map = {'M': 0, 'F': 1}
-            X_copy[col] = X_copy[col].map(gender_map)
-            
-        return X_copy
\ No newline at end of file
+        # Build the mapped columns directly instead of copying X and overwriting it;
+        # unknown values still come out as NaN
+        return pd.DataFrame(
+            {col: X[col].map(self.gender_map) for col in X.columns},
+            index=X.index,
+        )
\ No newline at end of file
@@ -1,14 +1,13 @@
 def get_recommendations(target_video_pid, target_cluster_label, all_videos_df, video_cluster_map, top_n=5):
     # Find all videos belonging to the same cluster
-    similar_video_pids = video_cluster_map[video_cluster_map['dbscan_cluster_label'] == target_cluster_label]['pid']
+    similar_video_pids = video_cluster_map.loc[video_cluster_map['dbscan_cluster_label'] == target_cluster_label, 'pid']
 
-    # Get the full details of these similar videos from the original dataframe
-    similar_videos_df = all_videos_df[all_videos_df['pid'].isin(similar_video_pids)]
-    
-    # Exclude the original video itself from the recommendations
-    similar_videos_df = similar_videos_df[similar_videos_df['pid'] != target_video_pid]
+    # Get the full details of these similar videos, excluding the original video itself, in one pass
+    pids = all_videos_df['pid']
+    similar_videos_df = all_videos_df[pids.isin(similar_video_pids.unique()) & (pids != target_video_pid)]
 
     # Rank these similar videos. Let's use 'watch_time' as the ranking metric.
-    recommendations = similar_videos_df.sort_values(by='watch_time', ascending=False)
+    # nlargest only keeps the top_n instead of sorting the whole cluster
+    recommendations = similar_videos_df.nlargest(top_n, 'watch_time')
 
-    return recommendations.head(top_n)
\ No newline at end of file
+    return recommendations
\ No newline at end of file
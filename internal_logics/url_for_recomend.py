@@ -1,13 +1,16 @@
 def url_for_videos(recommended_videos):
     BASE_URL = "https://fi.ee.tsinghua.edu.cn/datasets/short-video-dataset/raw_file/"
-    for index, row in recommended_videos.iterrows():
-        video_pid = row['pid']
-        video_title = row['title']
-    
-        video_url = f"{BASE_URL}{video_pid}.mp4"
-    
-        print(f"\nRecommendation #{index + 1}:")
-        print(f"  Title: {video_title}")
-        print(f"  PID: {video_pid}")
-        print(f"  Direct Link: {video_url}")
-    print("\n---------------------------------------------------------")
\ No newline at end of file
+    # Build every link in one vectorized string operation
+    video_urls = BASE_URL + recommended_videos['pid'].astype(str) + ".mp4"
+
+    # Format the whole report first and print it in one go
+    lines = []
+    for index, video_pid, video_title, video_url in zip(
+        recommended_videos.index, recommended_videos['pid'], recommended_videos['title'], video_urls
+    ):
+        lines.append(f"\nRecommendation #{index + 1}:")
+        lines.append(f"  Title: {video_title}")
+        lines.append(f"  PID: {video_pid}")
+        lines.append(f"  Direct Link: {video_url}")
+    lines.append("\n---------------------------------------------------------")
+    print("\n".join(lines))
\ No newline at end of file
@@ -1,9 +1,11 @@
 def makingVideoClusters(dbscan_sample_raw):
     # Step 6: Create the final mapping DataFrame with only the essential columns
-    video_cluster_map = dbscan_sample_raw[['pid', 'dbscan_cluster_label']]
-    # Step 7: Save this mapping to the final CSV file
+    # (nullable Int32 keeps rows whose cluster label is missing)
+    video_cluster_map = dbscan_sample_raw[['pid', 'dbscan_cluster_label']].astype({'pid': 'int64', 'dbscan_cluster_label': 'Int32'})
+    # Step 7: Save this mapping to the final CSV file, plus a Parquet copy that loads much faster
     video_cluster_map.to_csv("video_clusters.csv", index=False)
-    print("\nSuccessfully created 'video_clusters.csv'!")
+    video_cluster_map.to_parquet("video_clusters.parquet", compression='snappy', index=False)
+    print("\nSuccessfully created 'video_clusters.csv' and 'video_clusters.parquet'!")
     print("Here's a preview:")
     print(video_cluster_map.head())
     